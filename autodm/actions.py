@@ -1,9 +1,19 @@
-from typing import Optional
+from typing import Optional, Tuple
 from .character import Character, BattleState, CharacterState
 from .items import Item, WeaponAttack, EquipmentItem
 from .tools import roll_dice, apply_modifier
 from .spells import Spell
 import random
+import sys
+
+# The ability each skill check is based on, keyed by interned skill names
+SKILL_ABILITIES = {sys.intern(skill): ability for skill, ability in {
+    'athletics': 'strength',
+    'acrobatics': 'dexterity', 'sleight_of_hand': 'dexterity', 'stealth': 'dexterity',
+    'arcana': 'intelligence', 'history': 'intelligence', 'investigation': 'intelligence', 'nature': 'intelligence', 'religion': 'intelligence',
+    'animal_handling': 'wisdom', 'insight': 'wisdom', 'medicine': 'wisdom', 'perception': 'wisdom', 'survival': 'wisdom',
+    'deception': 'charisma', 'intimidation': 'charisma', 'performance': 'charisma', 'persuasion': 'charisma'
+}.items()}
 
 class Action:
     """Base class for all actions."""
@@ -37,30 +47,44 @@ class AttackAction(Action):
             damage=weapon.effects.get('damage', '1d4')
         )
 
-    def execute(self) -> str:
+    def resolve(self) -> Tuple[bool, int]:
+        """
+        Resolve the attack without describing it, for callers that only need the outcome.
+
+        Returns:
+        Tuple[bool, int]: Whether the attack hit, and the damage dealt.
+        """
         if self.target.character_state == CharacterState.DEAD:
-            return f"{self.target.name} is already dead and cannot be attacked."
+            return False, 0
 
         if isinstance(self.weapon, EquipmentItem):
             weapon_attack = self._get_weapon_attack(self.weapon)
         else:
             weapon_attack = self.weapon
 
-        attack_roll, _ = roll_dice("1d20")
+        attack_roll = roll_dice("1d20")[0]
         attack_total = apply_modifier(attack_roll, weapon_attack.hit_bonus)
         
         if attack_total >= self.target.armor_class:
-            damage, _ = roll_dice(weapon_attack.damage)  # damage is now the total, not a list of rolls
+            damage = sum(roll_dice(weapon_attack.damage))  # roll_dice lists each die, then any modifier
             old_hp = self.target.hp
             self.target.hp -= damage
-            actual_damage = old_hp - self.target.hp
-            result = (f"{self.character.name} hits {self.target.name} with {weapon_attack.name} for {actual_damage} damage! "
+            return True, old_hp - self.target.hp
+        return False, 0
+
+    def execute(self) -> str:
+        if self.target.character_state == CharacterState.DEAD:
+            return f"{self.target.name} is already dead and cannot be attacked."
+
+        hit, actual_damage = self.resolve()
+        if hit:
+            result = (f"{self.character.name} hits {self.target.name} with {self.weapon.name} for {actual_damage} damage! "
                       f"{self.target.name}'s HP: {self.target.hp}/{self.target.max_hp}")
             if self.target.character_state == CharacterState.DEAD:
                 result += f" {self.target.name} has been slain!"
             return result
         else:
-            return (f"{self.character.name} misses {self.target.name} with {weapon_attack.name}. "
+            return (f"{self.character.name} misses {self.target.name} with {self.weapon.name}. "
                     f"{self.target.name}'s HP: {self.target.hp}/{self.target.max_hp}")
 
 class CastSpellAction(Action):
@@ -88,14 +112,14 @@ class SkillCheckAction(Action):
     """Action for performing a skill check."""
     def __init__(self, character: Character, skill: str):
         super().__init__(character)
-        self.skill = skill
+        self.skill = sys.intern(skill.lower())  # Normalized once; SKILL_ABILITIES keys are lowercase
 
     def execute(self) -> str:
         skill_modifier = self.character.skills.get(self.skill, 0)
         ability = self.get_ability_for_skill(self.skill)
         ability_modifier = self.character.attributes.get_modifier(ability)
         
-        roll, _ = roll_dice("1d20")
+        roll = roll_dice("1d20")[0]
         total = roll + skill_modifier + ability_modifier
         
         result = f"{self.character.name} attempts a {self.skill.capitalize()} check: "
@@ -104,14 +128,7 @@ class SkillCheckAction(Action):
         return result
 
     def get_ability_for_skill(self, skill: str) -> str:
-        skill_ability_map = {
-            'athletics': 'strength',
-            'acrobatics': 'dexterity', 'sleight_of_hand': 'dexterity', 'stealth': 'dexterity',
-            'arcana': 'intelligence', 'history': 'intelligence', 'investigation': 'intelligence', 'nature': 'intelligence', 'religion': 'intelligence',
-            'animal_handling': 'wisdom', 'insight': 'wisdom', 'medicine': 'wisdom', 'perception': 'wisdom', 'survival': 'wisdom',
-            'deception': 'charisma', 'intimidation': 'charisma', 'performance': 'charisma', 'persuasion': 'charisma'
-        }
-        return skill_ability_map.get(skill.lower(), 'intelligence')  # Default to intelligence if skill not found
+        return SKILL_ABILITIES.get(skill, 'intelligence')  # Default to intelligence if skill not found
 
 class UseItemAction(Action):
     """Action for using an item."""
@@ -206,5 +223,5 @@ if __name__ == "__main__":
             print("\nThe battle has gone on for too long. Ending simulation.")
             break
 
-    print(f"\nFinal state of {player.name}: State: {player.character_state}, HP: {player.hp}/{player.max_hp}")
-    print(f"Final state of {enemy.name}: State: {enemy.character_state}, HP: {enemy.hp}/{enemy.max_hp}")
\ No newline at end of file
+    print(f"\nFinal state of {player.name}: State: {player.character_state.name}, HP: {player.hp}/{player.max_hp}")
+    print(f"Final state of {enemy.name}: State: {enemy.character_state.name}, HP: {enemy.hp}/{enemy.max_hp}")
\ No newline at end of file
@@ -1,7 +1,7 @@
-from typing import List, Dict, Union, Tuple, Literal, TYPE_CHECKING, Any
+from typing import List, Dict, Optional, Union, Tuple, Literal, TYPE_CHECKING, Any
 from .character import Character, CharacterState
 from .npc import NPC
-from .tools import roll_dice
+from .tools import roll_dice, roll_dice_batch
 from .llm import complete
 from .spells import Spell
 import random
@@ -12,6 +12,10 @@ if TYPE_CHECKING:
 else:
     CharacterUnion = Union[Any, NPC]
 
+def as_character(agent: CharacterUnion) -> Character:
+    """Return the Character behind a combatant: a PlayerAgent's character, or the NPC itself."""
+    return getattr(agent, 'character', agent)
+
 class BattleAgent:
     def __init__(self):
         self.context = "You are a Dungeon Master narrating a battle. Describe the actions and their results vividly, taking into account whether the action succeeded or failed and how much damage was dealt."
@@ -33,6 +37,9 @@ class Battle:
         self.current_turn: int = 0
         self.is_battle_over: bool = False
         self.turn_ending_actions = {"attack", "cast", "use", "move", "dash", "disengage", "dodge", "help", "hide", "ready"}
+        # Bumped by every Battle method that can change a combatant, so callers can cache derived views
+        self.state_version: int = 0
+        self._battle_state: Optional[Tuple[int, Dict[str, List[Dict[str, Union[str, int, bool]]]]]] = None
 
     def start_battle(self):
         for player in self.players:
@@ -44,7 +51,8 @@ class Battle:
 
     def roll_initiative(self):
         all_combatants = self.players + self.npcs
-        initiative_rolls = [(roll_dice("1d20")[0] + self.get_initiative(c), c) for c in all_combatants]
+        d20_rolls = roll_dice_batch("1d20", len(all_combatants))
+        initiative_rolls = [(rolls[0] + self.get_initiative(c), c) for rolls, c in zip(d20_rolls, all_combatants)]
         initiative_rolls.sort(reverse=True, key=lambda x: x[0])
         self.initiative_order = [agent for _, agent in initiative_rolls]
 
@@ -54,16 +62,10 @@ class Battle:
             print(f"{i}. {name}")
 
     def get_initiative(self, agent: CharacterUnion) -> int:
-        if hasattr(agent, 'character'):  # PlayerAgent
-            return agent.character.initiative
-        else:  # NPC
-            return agent.initiative
+        return as_character(agent).initiative
 
     def get_name(self, agent: CharacterUnion) -> str:
-        if hasattr(agent, 'character'):  # PlayerAgent
-            return agent.character.name
-        else:  # NPC
-            return agent.name
+        return as_character(agent).name
 
     def run_battle(self):
         while not self.is_battle_over:
@@ -72,10 +74,10 @@ class Battle:
             print("\n" + "="*40)  # Clear separator between turns
             
             if self.is_character_alive(current_agent):
-                if hasattr(current_agent, 'character'):  # PlayerAgent
-                    self.player_turn(current_agent)
-                else:  # NPC's turn
+                if isinstance(current_agent, NPC):
                     self.npc_turn(current_agent)
+                else:  # PlayerAgent
+                    self.player_turn(current_agent)
             else:
                 print(f"{self.get_name(current_agent)} is dead and cannot take any actions.")
 
@@ -83,10 +85,7 @@ class Battle:
             self.check_battle_status()
 
     def is_character_alive(self, agent: CharacterUnion) -> bool:
-        if hasattr(agent, 'character'):  # PlayerAgent
-            return agent.character.character_state == CharacterState.ALIVE
-        else:  # NPC
-            return agent.character_state == CharacterState.ALIVE
+        return as_character(agent).character_state == CharacterState.ALIVE
 
     def player_turn(self, player: Any):
         print(f"\n{player.character.name}'s turn!")
@@ -109,9 +108,8 @@ class Battle:
                     self.print_target_hp(target)
                     
                     # Generate narration after knowing the result
-                    target_hp = target.hp if isinstance(target, NPC) else target.character.hp
-                    target_max_hp = target.max_hp if isinstance(target, NPC) else target.character.max_hp
-                    narration = self.battle_agent.narrate(f"{response} - {'Success' if success else 'Failure'}, Damage: {damage}, Target HP: {target_hp}/{target_max_hp}")
+                    target_char = as_character(target)
+                    narration = self.battle_agent.narrate(f"{response} - {'Success' if success else 'Failure'}, Damage: {damage}, Target HP: {target_char.hp}/{target_char.max_hp}")
                     print(f"\nNarrator: {narration}")
                     
                     self.check_character_death(target)
@@ -155,11 +153,11 @@ class Battle:
         print(f"{npc.name}'s turn ends.")
 
     def get_target(self, action: str) -> Union[Any, NPC, None]:
-        words = action.lower().split()
+        words = action.casefold().split()
         if "attack" in words or "cast" in words:
             target_name = words[-1]
             for agent in self.initiative_order:
-                if self.get_name(agent).lower() == target_name.lower():
+                if self.get_name(agent).casefold() == target_name:
                     return agent
         return None
 
@@ -174,18 +172,19 @@ class Battle:
         return random.choice(living_targets) if living_targets else None
 
     def apply_action_effects(self, action: str, attacker: Union[Character, NPC], defender: CharacterUnion) -> Tuple[bool, int]:
-        attacker_char = attacker if isinstance(attacker, Character) else attacker
-        defender_char = defender.character if hasattr(defender, 'character') else defender
+        self.state_version += 1
+        attacker_char = as_character(attacker)
+        defender_char = as_character(defender)
 
         if "attacks" in action.lower():
             return self.resolve_weapon_attack(attacker_char, defender_char)
         elif "casts" in action.lower():
-            spell_name = action.split("casts")[1].split()[0].lower()
-            spell = next((s for s in attacker_char.spells if s.name.lower() == spell_name), None)
+            spell_name = action.split("casts")[1].split()[0]
+            spell = attacker_char.get_spell(spell_name)
             if spell:
                 if spell.attack_type == "heal":
                     return self.resolve_healing_spell(attacker_char, defender_char, spell)
-                elif spell.attack_type in ["ranged", "save"]:
+                elif spell.attack_type in {"ranged", "save"}:
                     return self.resolve_spell_attack(attacker_char, defender_char, spell)
                 elif spell.attack_type == "none":
                     return True, 0  # The spell was cast successfully but doesn't deal damage or heal
@@ -201,7 +200,8 @@ class Battle:
 
         if attack_roll >= 20 or (attack_roll != 1 and total_attack >= defender.armor_class):
             # Critical hit on 20, otherwise hit if meets or exceeds AC
-            weapon = attacker.get_equipped_weapons()[0] if attacker.get_equipped_weapons() else None
+            weapons = attacker.get_equipped_weapons()
+            weapon = weapons[0] if weapons else None
             damage_dice = weapon.effects['damage'] if weapon else "1d4"  # Unarmed strike damage
             damage_roll = roll_dice(damage_dice)
             damage = sum(damage_roll) + attacker.attributes.get_modifier('strength')
@@ -266,10 +266,8 @@ class Battle:
         return False, 0
 
     def print_target_hp(self, target: CharacterUnion):
-        if hasattr(target, 'character'):  # PlayerAgent
-            print(f"{target.character.name}'s HP: {target.character.hp}/{target.character.max_hp}")
-        else:  # NPC
-            print(f"{target.name}'s HP: {target.hp}/{target.max_hp}")
+        target_char = as_character(target)
+        print(f"{target_char.name}'s HP: {target_char.hp}/{target_char.max_hp}")
 
     def check_battle_status(self):
         players_alive = any(self.is_character_alive(p) for p in self.players)
@@ -294,7 +292,7 @@ class Battle:
                 print(f"Attack Result: The attack with {weapon} misses {target_name}.")
         elif "casts" in action.lower():
             spell_name = action.split("casts")[1].split()[0]
-            spell = next((s for s in self.get_current_character().spells if s.name.lower() == spell_name.lower()), None)
+            spell = self.get_current_character().get_spell(spell_name)
             if spell:
                 if spell.attack_type == "heal":
                     print(f"Spell Result: The {spell_name} spell successfully heals {target_name} for {amount} hit points!")
@@ -323,50 +321,44 @@ class Battle:
 
     def get_current_character(self) -> Union[Character, NPC]:
         current_agent = self.initiative_order[self.current_turn]
-        return current_agent.character if hasattr(current_agent, 'character') else current_agent
+        return as_character(current_agent)
 
     def check_character_death(self, character: CharacterUnion):
-        if hasattr(character, 'character'):  # PlayerAgent
-            if character.character.hp <= 0:
-                character.character.character_state = CharacterState.DEAD
-                print(f"{character.character.name} has died!")
-        else:  # NPC
-            if character.hp <= 0:
-                character.character_state = CharacterState.DEAD
-                print(f"{character.name} has died!")
+        self.state_version += 1
+        char = as_character(character)
+        if char.hp <= 0:
+            char.character_state = CharacterState.DEAD
+            print(f"{char.name} has died!")
 
     def get_battle_state(self) -> Dict[str, List[Dict[str, Union[str, int, bool]]]]:
         """
         Get the current state of the battle.
         
+        The result is cached until state_version changes, so callers must not modify it.
+
         Returns:
         Dict with keys 'allies' and 'enemies', each containing a list of character states.
         """
+        if self._battle_state is not None and self._battle_state[0] == self.state_version:
+            return self._battle_state[1]
+
         def character_state(char: CharacterUnion) -> Dict[str, Union[str, int, bool]]:
-            if hasattr(char, 'character'):  # PlayerAgent
-                c = char.character
-                return {
-                    "name": c.name,
-                    "class": c.chr_class,
-                    "level": c.level,
-                    "hp": c.hp,
-                    "max_hp": c.max_hp,
-                    "is_alive": self.is_character_alive(char)
-                }
-            else:
-                return {
-                    "name": char.name,
-                    "class": char.chr_class,
-                    "level": char.level,
-                    "hp": char.hp,
-                    "max_hp": char.max_hp,
-                    "is_alive": self.is_character_alive(char)
-                }
-
-        return {
+            c = as_character(char)
+            return {
+                "name": c.name,
+                "class": c.chr_class,
+                "level": c.level,
+                "hp": c.hp,
+                "max_hp": c.max_hp,
+                "is_alive": c.character_state == CharacterState.ALIVE
+            }
+
+        battle_state = {
             "allies": [character_state(player) for player in self.players],
             "enemies": [character_state(npc) for npc in self.npcs]
         }
+        self._battle_state = (self.state_version, battle_state)
+        return battle_state
 
 # Test scenario
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+# langchain pulls in torch and sentence-transformers, so it is only imported once an embedding is needed
+if TYPE_CHECKING:
+    from langchain.embeddings import HuggingFaceEmbeddings
+
+# Small sentence-embedding model; paraphrase matching on short commands doesn't need a larger one
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Minimum cosine similarity for a cache hit. It is only meaningful for EMBEDDING_MODEL, so change the two together.
+# 0.92 is an uncalibrated guess carried over from all-mpnet-base-v2 and has not been measured for MiniLM:
+# short prompts that differ in one word (e.g. "what's my hp" / "what's my status") may still score above it.
+SIMILARITY_THRESHOLD = 0.92
+# Partitions kept; every change to a character's state starts a new one, so the least recently used are dropped
+MAX_PARTITIONS = 32
+# Prompts kept per partition; the oldest are dropped first
+MAX_ENTRIES_PER_PARTITION = 64
+
+class SemanticCache:
+    """
+    A cache of LLM responses that also answers prompts that are worded differently but mean the same thing.
+
+    Prompts are embedded and compared by cosine similarity against earlier prompts in the same
+    partition. Callers choose the partition key so that a response is only reused in the exact
+    situation it was produced in (e.g. the same character in the same state). Only the
+    MAX_PARTITIONS most recently used partitions are kept, each with at most
+    MAX_ENTRIES_PER_PARTITION prompts.
+
+    Example:
+        >>> cache = SemanticCache()
+        >>> response, vector = cache.lookup("Alice", "what spells do I know?")
+        >>> if response is None:
+        ...     response = "Alice's known spells: Fireball"
+        ...     cache.insert("Alice", vector, response)
+        >>> cache.lookup("Alice", "what spells do I know?")[0]
+        "Alice's known spells: Fireball"
+
+        Rewordings are answered too when their similarity reaches the threshold.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        """
+        Initialize the SemanticCache.
+
+        Args:
+        threshold (float): The minimum cosine similarity for a cached prompt to count as a match.
+        """
+        self.threshold = threshold
+        self._embeddings: Optional['HuggingFaceEmbeddings'] = None
+        # partition -> (normalized prompt vectors stacked as rows, matching responses), least recently used first
+        self._partitions: 'OrderedDict[str, Tuple[np.ndarray, List[str]]]' = OrderedDict()
+
+    @property
+    def embeddings(self) -> 'HuggingFaceEmbeddings':
+        """The embedding model, loaded on first use."""
+        if self._embeddings is None:
+            from langchain.embeddings import HuggingFaceEmbeddings
+            self._embeddings = HuggingFaceEmbeddings(
+                model_name=EMBEDDING_MODEL,
+                encode_kwargs={"normalize_embeddings": True},
+            )
+        return self._embeddings
+
+    def embed(self, prompt: str) -> np.ndarray:
+        """Embed a prompt as a unit vector, so dot products are cosine similarities."""
+        return np.asarray(self.embeddings.embed_query(prompt), dtype=np.float32)
+
+    def lookup(self, partition: str, prompt: str) -> Tuple[Optional[str], np.ndarray]:
+        """
+        Find the cached response for the most similar prompt in a partition.
+
+        Args:
+        partition (str): The partition to search.
+        prompt (str): The prompt to look up.
+
+        Returns:
+        Tuple[Optional[str], np.ndarray]: The cached response (None on a miss) and the prompt's
+        embedding, which can be passed to insert to avoid embedding the prompt twice.
+        """
+        vector = self.embed(prompt)
+        if partition in self._partitions:
+            self._partitions.move_to_end(partition)
+            vectors, responses = self._partitions[partition]
+            similarities = vectors @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return responses[best], vector
+        return None, vector
+
+    def insert(self, partition: str, vector: np.ndarray, response: str) -> None:
+        """
+        Cache a response under a prompt embedding returned by lookup.
+
+        Args:
+        partition (str): The partition to store the response in.
+        vector (np.ndarray): The prompt's embedding.
+        response (str): The response to cache.
+        """
+        if partition in self._partitions:
+            vectors, responses = self._partitions[partition]
+            vectors = np.vstack([vectors, vector])[-MAX_ENTRIES_PER_PARTITION:]
+            responses = (responses + [response])[-MAX_ENTRIES_PER_PARTITION:]
+            self._partitions[partition] = (vectors, responses)
+            self._partitions.move_to_end(partition)
+        else:
+            self._partitions[partition] = (vector[np.newaxis, :], [response])
+            if len(self._partitions) > MAX_PARTITIONS:
+                self._partitions.popitem(last=False)
+
+semantic_cache = SemanticCache()
\ No newline at end of file
@@ -1,39 +1,112 @@
-from typing import List, Optional, Dict, Union, ClassVar, Tuple
-from pydantic import BaseModel, Field
+from typing import Any, Callable, List, Mapping, Optional, Dict, Union, ClassVar, Tuple
+from dataclasses import dataclass, field
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+import logging
 import random
+import sys
+from types import MappingProxyType
 from .items import Item, WeaponAttack, EquipmentItem
-from enum import Enum
+from enum import IntEnum
 from .spells import Spell, fireball, magic_missile, shield, cure_wounds  # Import specific spells
-import copy
 
-class BattleState(Enum):
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_NAMES: Tuple[str, ...] = ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")
+
+_D6 = (1, 2, 3, 4, 5, 6)
+
+# Indices into ATTRIBUTE_NAMES that a race's free +1 choices can go to: any attribute but charisma (last)
+_CHOICE_INDICES = tuple(range(len(ATTRIBUTE_NAMES) - 1))
+
+class BattleState(IntEnum):
     NOT_IN_BATTLE = 0
     IN_BATTLE = 1
 
-class CharacterState(Enum):
+class CharacterState(IntEnum):
     ALIVE = 0
     DEAD = 1
 
-class Attributes(BaseModel):
-    strength: int = Field(10, ge=1, le=20)
-    dexterity: int = Field(10, ge=1, le=20)
-    constitution: int = Field(10, ge=1, le=20)
-    intelligence: int = Field(10, ge=1, le=20)
-    wisdom: int = Field(10, ge=1, le=20)
-    charisma: int = Field(10, ge=1, le=20)
+@dataclass(frozen=True, slots=True)
+class Attributes:
+    strength: int = 10
+    dexterity: int = 10
+    constitution: int = 10
+    intelligence: int = 10
+    wisdom: int = 10
+    charisma: int = 10
+    # Every attribute's modifier, computed once since the scores never change
+    modifiers: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        modifiers = {}
+        for attr in ATTRIBUTE_NAMES:
+            value = getattr(self, attr)
+            if not 1 <= value <= 20:
+                raise ValueError(f"{attr} must be between 1 and 20, got {value}")
+            modifiers[attr] = (value - 10) // 2
+        object.__setattr__(self, 'modifiers', modifiers)
 
     def get_modifier(self, attribute: str) -> int:
-        """Calculate the modifier for a given attribute."""
-        return (getattr(self, attribute) - 10) // 2
+        """Get the modifier for a given attribute."""
+        return self.modifiers[attribute]
 
     def __str__(self):
-        return "\n".join([f"{attr.capitalize()}: {getattr(self, attr)} ({self.get_modifier(attr):+d})" for attr in self.__fields__])
+        return "\n".join([f"{attr.capitalize()}: {getattr(self, attr)} ({self.get_modifier(attr):+d})" for attr in ATTRIBUTE_NAMES])
 
-class Relationship(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Relationship:
     target: str  # Name of the character this relationship is with
-    attitude: int = Field(0, ge=-100, le=100)  # -100 (hostile) to 100 (friendly)
+    attitude: int = 0  # -100 (hostile) to 100 (friendly)
     description: str = ""
 
+    def __post_init__(self):
+        if not -100 <= self.attitude <= 100:
+            raise ValueError(f"attitude must be between -100 and 100, got {self.attitude}")
+
+# Spells every new character of a class starts out knowing
+_DEFAULT_SPELLS: Mapping[str, Tuple[Spell, ...]] = MappingProxyType({
+    "Wizard": (fireball, magic_missile, shield),
+    "Sorcerer": (fireball, magic_missile, shield),
+    "Cleric": (cure_wounds,),
+    "Druid": (cure_wounds,),
+    "Paladin": (cure_wounds,),
+})
+
+# Classes that gain spell slots as they level up
+_SPELLCASTERS = frozenset({"Wizard", "Sorcerer", "Bard", "Cleric", "Druid"})
+
+def _starting_spell_slots(chr_class: str, level: int) -> Tuple[int, ...]:
+    """The spell slots, indexed by spell level, that a new spellcaster of the given class and level starts with."""
+    spell_slots = [0] * 10
+    if chr_class == "Wizard" and level == 5:
+        spell_slots[1:5] = [4, 3, 2, 1]
+    else:
+        if level >= 1:
+            spell_slots[1] = 2
+        if level >= 3:
+            spell_slots[2] = 2
+        if level >= 5:
+            spell_slots[3] = 2
+    return tuple(spell_slots)
+
+# Starting spell slots for every (spellcaster class, level), looked up instead of recomputed per character
+_SPELL_SLOT_TABLE: Mapping[Tuple[str, int], Tuple[int, ...]] = MappingProxyType({
+    (chr_class, level): _starting_spell_slots(chr_class, level)
+    for chr_class in _SPELLCASTERS
+    for level in range(1, 21)
+})
+
+_NO_SPELL_SLOTS: Tuple[int, ...] = (0,) * 10
+
+@dataclass(frozen=True, slots=True)
+class ClassInfo:
+    """Constants derived from a character class, computed once at import."""
+    hit_dice: str  # e.g. "1d10"
+    hit_die: int  # e.g. 10
+    primary: str
+    default_spells: Tuple[Spell, ...]
+    spellcaster: bool
+
 class Character(BaseModel):
     name: str
     chr_class: str
@@ -44,17 +117,17 @@ class Character(BaseModel):
     experience_points: int
     attributes: Attributes
     proficiency_bonus: int
-    armor_class: int
     initiative: int
     speed: int
     max_hp: int
     current_hp: int = Field(...)  # Remove the default value and alias
     spells: List[Spell] = Field(default_factory=list)
-    spell_slots: Dict[int, int] = Field(default_factory=lambda: {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 0})
+    spell_slots: List[int] = Field(default_factory=lambda: [0] * 10)  # Indexed by spell level (0-9)
     relationships: Dict[str, Relationship] = Field(default_factory=dict)
 
     class Config:
         arbitrary_types_allowed = True
+        populate_by_name = True
 
     @property
     def hp(self) -> int:
@@ -63,19 +136,25 @@ class Character(BaseModel):
     @hp.setter
     def hp(self, value: int) -> None:
         self.current_hp = max(0, min(value, self.max_hp))
-        self.check_death()
+        if self.current_hp == 0:
+            self.check_death()
 
     skills: Dict[str, int] = {}
-    equipped_items: Dict[str, List[Optional[EquipmentItem]]] = Field(default_factory=lambda: {
-        "weapon": [],
-        "armor": [],
-        "accessory": []
-    })
+    equipped: List[EquipmentItem] = Field(default_factory=list)  # Each item carries its own slot
     inventory: List[EquipmentItem] = Field(default_factory=list)
     movement_speed: int = 30  # Default movement speed in feet
     movement_remaining: int = 30  # Default movement remaining in feet
     battle_state: BattleState = BattleState.NOT_IN_BATTLE  # Default battle state
     character_state: CharacterState = CharacterState.ALIVE  # Default character state
+    # Fixed armor class passed as armor_class=..., used until the equipment changes
+    armor_class_override: Optional[int] = Field(default=None, alias="armor_class")
+    _armor_base: int = PrivateAttr(default=10)  # Best equipped body armor AC, 10 when unarmored
+    _ac_bonus: int = PrivateAttr(default=0)  # Sum of AC bonuses from shields, rings, etc.
+    _spells_by_name: Dict[str, Spell] = PrivateAttr(default_factory=dict)  # self.spells indexed by casefolded name
+    _inventory_by_name: Dict[str, EquipmentItem] = PrivateAttr(default_factory=dict)  # First inventory item per casefolded name
+    _inventory_weight: float = PrivateAttr(default=0.0)  # Sum of weight * quantity over self.inventory
+    _equipped_summary: Optional[str] = PrivateAttr(default=None)  # "slot: name, ..." for __str__, None when stale
+    _equipped_weapons: Optional[Tuple[EquipmentItem, ...]] = PrivateAttr(default=None)  # None when stale
 
     RACES: ClassVar[Dict[str, Dict[str, int]]] = {
         "Human": {"all": 1},
@@ -89,6 +168,15 @@ class Character(BaseModel):
         "Tiefling": {"intelligence": 1, "charisma": 2}
     }
 
+    # Interned so lookups with interned names (see make_generator) hit on identity
+    RACE_NAMES: ClassVar[Tuple[str, ...]] = tuple(map(sys.intern, RACES))
+
+    # RACES flattened to (per-attribute deltas in ATTRIBUTE_NAMES order, number of free +1 choices)
+    RACE_MODIFIERS: ClassVar[Mapping[str, Tuple[Tuple[int, ...], int]]] = MappingProxyType({
+        race: (tuple(mods.get("all", 0) + mods.get(attr, 0) for attr in ATTRIBUTE_NAMES), mods.get("choice", 0))
+        for race, mods in RACES.items()
+    })
+
     CLASSES: ClassVar[Dict[str, Dict[str, str]]] = {
         "Barbarian": {"hit_dice": "1d12", "primary": "strength"},
         "Bard": {"hit_dice": "1d8", "primary": "charisma"},
@@ -104,6 +192,44 @@ class Character(BaseModel):
         "Wizard": {"hit_dice": "1d6", "primary": "intelligence"}
     }
 
+    CLASS_NAMES: ClassVar[Tuple[str, ...]] = tuple(map(sys.intern, CLASSES))
+
+    # CLASSES resolved once into typed records, with the hit die already parsed
+    CLASS_INFO: ClassVar[Mapping[str, ClassInfo]] = MappingProxyType({
+        chr_class: ClassInfo(
+            hit_dice=info["hit_dice"],
+            hit_die=int(info["hit_dice"].split('d')[1]),
+            primary=info["primary"],
+            default_spells=_DEFAULT_SPELLS.get(chr_class, ()),
+            spellcaster=chr_class in _SPELLCASTERS,
+        )
+        for chr_class, info in CLASSES.items()
+    })
+
+    BACKGROUNDS: ClassVar[Tuple[str, ...]] = tuple(map(sys.intern, (
+        "Acolyte", "Criminal", "Folk Hero", "Noble", "Sage", "Soldier"
+    )))
+
+    ALIGNMENTS: ClassVar[Tuple[str, ...]] = tuple(map(sys.intern, (
+        "Lawful Good", "Neutral Good", "Chaotic Good",
+        "Lawful Neutral", "True Neutral", "Chaotic Neutral",
+        "Lawful Evil", "Neutral Evil", "Chaotic Evil"
+    )))
+
+    @field_validator('skills')
+    @classmethod
+    def normalize_skills(cls, skills: Dict[str, int]) -> Dict[str, int]:
+        """Key skills by interned lowercase name, matching what skill checks look up."""
+        return {sys.intern(skill.lower()): modifier for skill, modifier in skills.items()}
+
+    def model_post_init(self, __context: Any) -> None:
+        self._spells_by_name = {spell.name.casefold(): spell for spell in reversed(self.spells)}
+        self._inventory_by_name = {}
+        self._inventory_weight = 0.0
+        self._index_inventory(self.inventory)
+        if self.equipped:
+            self._rebuild_armor_class()
+
     def add_spell(self, spell: Spell):
         """
         Add a spell to the character's spell list if they don't already know it.
@@ -115,15 +241,21 @@ class Character(BaseModel):
         Returns:
         bool: True if the spell was added, False if the character already knew the spell.
         """
-        if not any(existing_spell.name == spell.name for existing_spell in self.spells):
-            spell_copy = copy.deepcopy(spell)
-            self.spells.append(spell_copy)
-            return True
-        return False
+        key = spell.name.casefold()
+        if key in self._spells_by_name:
+            return False
+        known = spell.model_copy()
+        self._spells_by_name[key] = known
+        self.spells.append(known)
+        return True
+
+    def get_spell(self, spell_name: str) -> Optional[Spell]:
+        """Get a spell the character knows by name (case-insensitive), or None if they don't know it."""
+        return self._spells_by_name.get(spell_name.casefold())
 
     def can_cast_spell(self, spell: Spell) -> bool:
         """Check if the character can cast the given spell."""
-        return self.spell_slots.get(spell.level, 0) > 0
+        return self.spell_slots[spell.level] > 0
 
     def cast_spell(self, spell: Spell) -> None:
         """Cast a spell, using up a spell slot."""
@@ -144,197 +276,242 @@ class Character(BaseModel):
         Returns:
         Character: A new Character instance with randomly generated attributes.
         """
-        def roll_attribute():
-            return sum(sorted([random.randint(1, 6) for _ in range(4)])[1:])
-
-        attributes = Attributes(
-            strength=roll_attribute(),
-            dexterity=roll_attribute(),
-            constitution=roll_attribute(),
-            intelligence=roll_attribute(),
-            wisdom=roll_attribute(),
-            charisma=roll_attribute()
-        )
+        chr_race = kwargs.pop('chr_race', None) or random.choice(cls.RACE_NAMES)
+        chr_class = kwargs.pop('chr_class', None) or random.choice(cls.CLASS_NAMES)
+        return cls.make_generator(chr_class, chr_race, **kwargs)(name)
+
+    @classmethod
+    def make_generator(cls, chr_class: str, chr_race: str, level: int = 1, **kwargs) -> Callable[..., 'Character']:
+        """
+        Build a function that generates characters of one class, race and level.
+
+        Everything that depends only on the class, race and level is resolved once here, so the
+        returned function only rolls attributes and picks a background and alignment per character.
+        The returned function also accepts a background and alignment already drawn by the caller.
+
+        Args:
+        chr_class (str): The characters' class.
+        chr_race (str): The characters' race.
+        level (int): The characters' level (default is 1).
+        **kwargs: Additional arguments to pass to the Character constructor for every character.
+
+        Returns:
+        Callable[..., Character]: A function taking a name (and optionally a background and alignment)
+        and returning a new Character.
+
+        Example:
+        >>> make_goblin = Character.make_generator("Rogue", "Half-Orc", level=2)
+        >>> goblins = [make_goblin(f"Goblin {i}") for i in range(20)]
+        """
+        chr_class, chr_race = sys.intern(chr_class), sys.intern(chr_race)
+        race_deltas, race_choices = cls.RACE_MODIFIERS[chr_race]
+        class_info = cls.CLASS_INFO[chr_class]
+
+        spell_slots = _SPELL_SLOT_TABLE.get((chr_class, level), _NO_SPELL_SLOTS)
+        if spell_slots is _NO_SPELL_SLOTS and class_info.spellcaster:
+            spell_slots = _starting_spell_slots(chr_class, level)  # Level outside the table's 1-20 range
+
+        def generate_one(name: str, background: Optional[str] = None, alignment: Optional[str] = None) -> 'Character':
+            # 4d6 per attribute, all drawn in one call; each attribute drops its lowest die
+            dice = random.choices(_D6, k=4 * len(ATTRIBUTE_NAMES))
+            rolls = [dice[i:i + 4] for i in range(0, len(dice), 4)]
+            scores = [sum(roll) - min(roll) + delta for roll, delta in zip(rolls, race_deltas)]
+            # For races like Half-Elf that get to choose which (different) attributes to increase
+            for i in random.sample(_CHOICE_INDICES, race_choices):
+                scores[i] += 1
+            attributes = Attributes(**dict(zip(ATTRIBUTE_NAMES, scores)))
+            modifiers = attributes.modifiers
+            max_hp = class_info.hit_die + modifiers['constitution']
+
+            args = {
+                "name": name,
+                "chr_class": chr_class,
+                "level": level,
+                "chr_race": chr_race,
+                "background": background or random.choice(cls.BACKGROUNDS),
+                "alignment": alignment or random.choice(cls.ALIGNMENTS),
+                "experience_points": 0,
+                "attributes": attributes,
+                "proficiency_bonus": 2,
+                "initiative": modifiers['dexterity'],
+                "speed": 30,  # Default speed, can be adjusted based on race
+                "max_hp": max_hp,
+                "current_hp": max_hp,  # Set current_hp to max_hp initially
+                "skills": {},  # Skills can be added based on class and background
+                "spells": [],  # Start with an empty spell list
+                "spell_slots": list(spell_slots),
+                **kwargs,
+            }
+            # Everything generated or drawn from the class tables is already valid, so only caller-supplied kwargs need validating
+            character = cls(**args) if kwargs else cls.model_construct(**args)
+
+            # Add default spells using the add_spell method
+            for spell in class_info.default_spells:
+                character.add_spell(spell)
+
+            return character
+
+        return generate_one
 
-        chr_race = kwargs.get('chr_race', random.choice(list(cls.RACES.keys())))
-        chr_class = kwargs.get('chr_class', random.choice(list(cls.CLASSES.keys())))
-
-        # Apply racial modifiers
-        race_mods = cls.RACES[chr_race]
-        for attr, mod in race_mods.items():
-            if attr == "all":
-                for key in attributes.__fields__:
-                    setattr(attributes, key, getattr(attributes, key) + mod)
-            elif attr == "choice":
-                # For races like Half-Elf that get to choose which attributes to increase
-                for _ in range(mod):
-                    chosen_attr = random.choice([a for a in attributes.__fields__ if a != "charisma"])
-                    setattr(attributes, chosen_attr, getattr(attributes, chosen_attr) + 1)
-            else:
-                setattr(attributes, attr, getattr(attributes, attr) + mod)
-
-        level = kwargs.get('level', 1)
-        proficiency_bonus = 2
-        armor_class = 10 + attributes.get_modifier('dexterity')
-        initiative = attributes.get_modifier('dexterity')
-        speed = kwargs.get('speed', 30)  # Default speed, can be adjusted based on race
-        hit_dice = cls.CLASSES[chr_class]["hit_dice"]
-        max_hp = int(hit_dice.split('d')[1]) + attributes.get_modifier('constitution')
-
-        default_spells = []
-        if chr_class in ["Wizard", "Sorcerer"]:
-            default_spells.extend([fireball, magic_missile, shield])
-        elif chr_class in ["Cleric", "Druid", "Paladin"]:
-            default_spells.append(cure_wounds)
-
-        # Set up spell slots based on class and level
-        spell_slots = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 0}
-        if chr_class in ["Wizard", "Sorcerer", "Bard", "Cleric", "Druid"]:
-            if level >= 1:
-                spell_slots[1] = 2
-            if level >= 3:
-                spell_slots[2] = 2
-            if level >= 5:
-                spell_slots[3] = 2
-
-        default_args = {
-            "name": name,
-            "chr_class": chr_class,
-            "level": level,
-            "chr_race": chr_race,
-            "background": random.choice(["Acolyte", "Criminal", "Folk Hero", "Noble", "Sage", "Soldier"]),
-            "alignment": random.choice(["Lawful Good", "Neutral Good", "Chaotic Good", "Lawful Neutral", "True Neutral", "Chaotic Neutral", "Lawful Evil", "Neutral Evil", "Chaotic Evil"]),
-            "experience_points": 0,
-            "attributes": attributes,
-            "proficiency_bonus": proficiency_bonus,
-            "armor_class": armor_class,
-            "initiative": initiative,
-            "speed": speed,
-            "max_hp": max_hp,
-            "current_hp": max_hp,  # Set current_hp to max_hp initially
-            "hit_dice": hit_dice,
-            "skills": {},  # Skills can be added based on class and background
-            "spells": [],  # Start with an empty spell list
-            "spell_slots": spell_slots
-        }
-
-        # Update default_args with any additional kwargs
-        default_args.update(kwargs)
-
-        character = cls(**default_args)
-
-        # Add default spells using the new add_spell method
-        for spell in default_spells:
-            character.add_spell(spell)
-
-        # Set up spell slots for a level 5 Wizard
-        if character.chr_class.lower() == "wizard" and character.level == 5:
-            character.spell_slots = {1: 4, 2: 3, 3: 2, 4: 1, 5: 0, 6: 0, 7: 0, 8: 0, 9: 0}
-
-        return character
+    @classmethod
+    def generate_party(cls, names: List[str], **kwargs) -> List['Character']:
+        """
+        Generate one character per name, drawing races, classes, backgrounds and alignments in bulk.
+
+        Args:
+        names (List[str]): The characters' names.
+        **kwargs: Additional arguments passed to `generate` for every character (these override the draws).
+
+        Returns:
+        List[Character]: The generated characters, in the same order as `names`.
+
+        Example:
+        >>> party = Character.generate_party(["Aric", "Thorne", "Zira"], level=3)
+        """
+        n = len(names)
+        draws = zip(
+            random.choices(cls.RACE_NAMES, k=n),
+            random.choices(cls.CLASS_NAMES, k=n),
+            random.choices(cls.BACKGROUNDS, k=n),
+            random.choices(cls.ALIGNMENTS, k=n),
+        )
+        overrides = dict(kwargs)
+        race_override = overrides.pop('chr_race', None)
+        class_override = overrides.pop('chr_class', None)
+
+        # The draws are passed to each generator separately from the caller's overrides, so characters
+        # are only validated when the caller actually supplied overrides
+        generators: Dict[Tuple[str, str], Callable[..., 'Character']] = {}
+        party = []
+        for name, (chr_race, chr_class, background, alignment) in zip(names, draws):
+            key = (class_override or chr_class, race_override or chr_race)
+            if key not in generators:
+                generators[key] = cls.make_generator(*key, **overrides)
+            party.append(generators[key](name, background, alignment))
+        return party
 
     def equip_item(self, item: EquipmentItem) -> None:
         """
         Equip an item to the character.
         """
-        if item.item_type.lower() in ['weapon', 'armor', 'shield', 'ring']:
-            slot = item.item_type.lower()
-            if slot == 'shield':
-                slot = 'armor'
-            self.equipped_items[slot].append(item)
-            print(f"Equipped: {item.name}")
-            self.calculate_armor_class()
+        if item.item_type in {'weapon', 'armor', 'shield', 'ring'}:
+            self.equipped.append(item)
+            self._equipped_summary = None
+            self._equipped_weapons = None
+            logger.debug("Equipped: %s", item.name)
+            self.armor_class_override = None
+            self._add_armor_class(item)
         else:
             raise ValueError(f"{item.name} is not equippable.")
 
-    def get_equipped_weapons(self) -> List[EquipmentItem]:
-        """Get a list of all equipped weapons."""
-        return [item for item in self.equipped_items['weapon'] if item is not None]
+    def get_equipped_weapons(self) -> Tuple[EquipmentItem, ...]:
+        """Get all equipped weapons, recomputed only after the equipment changes."""
+        if self._equipped_weapons is None:
+            self._equipped_weapons = tuple(item for item in self.equipped if item.slot == 'weapon')
+        return self._equipped_weapons
+
+    def _add_armor_class(self, item: EquipmentItem) -> None:
+        """Fold one equipped item into the cached armor class components."""
+        armor_class = item.armor_class_base
+        if armor_class is None:
+            return
+        if item.item_type == 'armor':
+            # Body armor replaces the unarmored base rather than stacking
+            self._armor_base = max(self._armor_base, armor_class)
+        else:
+            # Shields, rings and other items add their bonus on top
+            self._ac_bonus += armor_class
 
-    def calculate_armor_class(self):
+    @property
+    def armor_class(self) -> int:
+        """The character's armor class: the fixed value it was created with, else from equipped items and dexterity."""
+        if self.armor_class_override is not None:
+            return self.armor_class_override
+        return self._armor_base + self.attributes.modifiers['dexterity'] + self._ac_bonus
+
+    def _rebuild_armor_class(self) -> None:
+        """Recompute the cached armor class components from the equipped items."""
+        self._armor_base = 10
+        self._ac_bonus = 0
+        for item in self.equipped:
+            self._add_armor_class(item)
+
+    def calculate_armor_class(self) -> int:
         """
-        Calculate the character's armor class based on equipped items and dexterity.
+        Recalculate the character's armor class from scratch based on equipped items and dexterity.
+
+        This replaces any fixed armor class the character was created with.
         """
-        dex_modifier = self.attributes.get_modifier('dexterity')
-        base_ac = 10 + dex_modifier  # Start with base AC
-
-        armor = self.equipped_items.get('armor')
-        if armor:
-            for item in armor:
-                if 'armor_class' in item.effects:
-                    if isinstance(item.effects['armor_class'], int):
-                        base_ac = max(base_ac, item.effects['armor_class'] + dex_modifier)
-                    else:
-                        # If it's a string (like "11 + Dex modifier"), we'll need to parse it
-                        armor_base = int(item.effects['armor_class'].split()[0])
-                        base_ac = max(base_ac, armor_base + dex_modifier)
-
-        # Add AC bonuses from other equipped items
-        for item in self.equipped_items.values():
-            if item:
-                for i in item:
-                    if i and 'armor_class' in i.effects:
-                        if isinstance(i.effects['armor_class'], int):
-                            base_ac += i.effects['armor_class']
-
-        self.armor_class = base_ac
-        print(f"Armor Class recalculated: {self.armor_class}")
+        self.armor_class_override = None
+        self._rebuild_armor_class()
+        logger.debug("Armor Class recalculated: %d", self.armor_class)
+        return self.armor_class
 
     def unequip_item(self, item_type: str):
         """
-        Unequip an item and remove its effects from the character.
+        Unequip all items in a slot and remove their effects from the character.
 
         Args:
-        item_type (str): The type of item to unequip.
+        item_type (str): The slot to unequip (e.g. "weapon", "armor").
         """
-        item = self.equipped_items.get(item_type.lower())
-        if item:
-            # Remove the item from equipped items
-            self.equipped_items[item_type.lower()] = []
-            
-            # Add the item back to inventory
-            self.inventory.append(item)
-            
+        slot = item_type.lower()
+        removed = [item for item in self.equipped if item.slot == slot]
+        if removed:
+            # Remove the items from equipped items
+            self.equipped = [item for item in self.equipped if item.slot != slot]
+            self._equipped_summary = None
+            self._equipped_weapons = None
+
+            # Add the items back to inventory
+            self.inventory.extend(removed)
+            self._index_inventory(removed)
+
             # Recalculate armor class
             self.calculate_armor_class()
-            
-            print(f"Unequipped: {item.name}")
+
+            logger.debug("Unequipped: %s", ", ".join(item.name for item in removed))
         else:
-            print(f"No item equipped in {item_type} slot.")
+            logger.debug("No item equipped in %s slot.", item_type)
 
-    def add_to_inventory(self, item: Item):
+    def add_to_inventory(self, item: EquipmentItem):
         """
         Add an item to the character's inventory.
 
         Args:
-        item (Item): The item to add to the inventory.
+        item (EquipmentItem): The item to add to the inventory.
         """
         self.inventory.append(item)
+        self._index_inventory([item])
 
-    @property
-    def hp(self) -> int:
-        return self.current_hp
+    def _index_inventory(self, items: List[EquipmentItem]) -> None:
+        """Add newly stored inventory items to the name index (keeping the first item of each name) and the total weight."""
+        for item in items:
+            self._inventory_by_name.setdefault(item.name.casefold(), item)
+            self._inventory_weight += item.weight * item.quantity
 
-    @hp.setter
-    def hp(self, value: int) -> None:
-        self.current_hp = max(0, min(value, self.max_hp))
-        self.check_death()
+    def total_weight(self) -> float:
+        """The total weight of everything in the character's inventory."""
+        return self._inventory_weight
+
+    def get_inventory_item(self, item_name: str) -> Optional[EquipmentItem]:
+        """Get an item from the character's inventory by name (case-insensitive), or None if they don't have it."""
+        return self._inventory_by_name.get(item_name.casefold())
 
     def check_death(self) -> None:
         """Check if the character has died and update their state accordingly."""
         if self.current_hp <= 0:
-            self.current_hp = 0  # Ensure HP doesn't go below 0
             self.character_state = CharacterState.DEAD
-            print(f"{self.name} has died!")
+            logger.debug("%s has died!", self.name)
 
     def __str__(self):
         status = "ALIVE" if self.character_state == CharacterState.ALIVE else "DEAD"
-        equipped_items_str = ", ".join([f"{slot}: {', '.join([item.name for item in items if item])}" for slot, items in self.equipped_items.items() if items])
+        if self._equipped_summary is None:
+            self._equipped_summary = ", ".join([f"{item.slot}: {item.name}" for item in self.equipped])
         return (f"{self.name}, Level {self.level} {self.chr_race} {self.chr_class} ({status})\n"
                 f"Attributes:\n{self.attributes}\n"
                 f"Armor Class: {self.armor_class}\n"
                 f"Hit Points: {self.current_hp}/{self.max_hp}\n"
-                f"Equipped: {equipped_items_str}")
+                f"Equipped: {self._equipped_summary}")
 
     def reset_movement(self):
         """Reset the character's movement at the start of their turn."""
@@ -375,8 +552,8 @@ class Characters:
         char2 = self.get_character(character2_name)
         
         if char1 and char2:
-            char1.set_relationship(character2_name, attitude, description)
-            char2.set_relationship(character1_name, attitude, description)
+            char1.relationships[character2_name] = Relationship(character2_name, attitude, description)
+            char2.relationships[character1_name] = Relationship(character1_name, attitude, description)
         else:
             raise ValueError("One or both characters not found.")
 
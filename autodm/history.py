@@ -1,13 +1,31 @@
-from typing import List, Dict
+from typing import List, Dict, Literal, Optional, TYPE_CHECKING
 from datetime import datetime
+import atexit
 import json
+import weakref
 from pathlib import Path
 from operator import itemgetter
 
-from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
-from langchain.docstore.document import Document
-from langchain.text_splitter import CharacterTextSplitter
+# langchain pulls in torch, transformers and faiss, so it is only imported once vector search is used
+if TYPE_CHECKING:
+    from langchain.embeddings import HuggingFaceEmbeddings
+    from langchain.vectorstores import FAISS
+    from langchain.docstore.document import Document
+
+# Number of new entries embedded together in one batch
+EMBED_BATCH_SIZE = 16
+# Number of new entries after which the vector index is written back to disk
+INDEX_FLUSH_EVERY = 32
+
+# Every History still in use; weak references, so registering for the exit flush doesn't keep one alive
+_open_histories: 'weakref.WeakSet[History]' = weakref.WeakSet()
+
+@atexit.register
+def _flush_open_histories():
+    """Save the vector index of every History that loaded one, without loading models just to flush."""
+    for history in list(_open_histories):
+        if history._index is not None:
+            history.flush()
 
 class History:
     """
@@ -17,33 +35,76 @@ class History:
     using vector search capabilities.
     """
 
+    # The embedding model is large, so it is loaded on first use and shared by every History
+    _shared_embeddings: Optional['HuggingFaceEmbeddings'] = None
+
     def __init__(self):
         """
         Initialize the History object.
         """
         self.config_dir = Path.home() / ".autodm"
         self.config_dir.mkdir(exist_ok=True)
-        self.history_file = self.config_dir / "history.json"
+        self.history_file = self.config_dir / "history.jsonl"
+        self.legacy_history_file = self.config_dir / "history.json"
         self.index_file = self.config_dir / "faiss_index"
         
         self.history: List[Dict] = self._load_history()
-        self.embeddings = HuggingFaceEmbeddings()
-        self.index = self._load_or_create_index()
+        self._index: Optional['FAISS'] = None
+        self._pending_documents: List['Document'] = []  # Entries waiting to be embedded and indexed
+        self._unsaved_entries = 0  # Entries added to the index since it was last saved
+        _open_histories.add(self)
 
     def _load_history(self) -> List[Dict]:
-        """Load the history from the JSON file."""
+        """Load the history from the JSON lines file, migrating a history saved in the older JSON format."""
         if self.history_file.exists():
             with open(self.history_file, 'r') as f:
-                return json.load(f)
+                return [json.loads(line) for line in f if line.strip()]
+        if self.legacy_history_file.exists():
+            with open(self.legacy_history_file, 'r') as f:
+                history = json.load(f)
+            with open(self.history_file, 'w') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in history)
+            return history
         return []
 
-    def _save_history(self):
-        """Save the current history to the JSON file."""
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=2)
+    def _append_entry(self, entry: Dict):
+        """Append one entry to the JSON lines file, leaving earlier entries untouched."""
+        with open(self.history_file, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    @property
+    def embeddings(self) -> 'HuggingFaceEmbeddings':
+        """The embedding model shared by all History instances, loaded on first use."""
+        if History._shared_embeddings is None:
+            from langchain.embeddings import HuggingFaceEmbeddings
+            History._shared_embeddings = HuggingFaceEmbeddings()
+        return History._shared_embeddings
+
+    @property
+    def index(self) -> 'FAISS':
+        """The vector index, loaded or created on first use."""
+        if self._index is None:
+            self._index = self._load_or_create_index()
+            self._queue_unindexed_entries()
+        return self._index
+
+    def _queue_unindexed_entries(self):
+        """
+        Queue logged entries that never reached the saved index, e.g. because the process stopped
+        before they were indexed, so they are embedded with the next batch.
+
+        The index holds entries in the order they were logged, so the missing ones are those after
+        its last entry, up to the entries already waiting in this session's buffer.
+        """
+        indexed = self._index.index.ntotal
+        buffered_from = len(self.history) - len(self._pending_documents)
+        missing = [self._to_document(entry) for entry in self.history[indexed:buffered_from]]
+        if missing:
+            self._pending_documents = missing + self._pending_documents
 
-    def _load_or_create_index(self) -> FAISS:
+    def _load_or_create_index(self) -> 'FAISS':
         """Load existing FAISS index or create a new one."""
+        from langchain.vectorstores import FAISS
         if self.index_file.exists():
             return FAISS.load_local(str(self.index_file), self.embeddings)
         return FAISS.from_documents([], self.embeddings)
@@ -67,12 +128,34 @@ class History:
             "content": content
         }
         self.history.append(entry)
-        self._save_history()
+        self._append_entry(entry)
 
         # Update vector index
-        doc = Document(page_content=f"{role}: {content}", metadata={"timestamp": entry["timestamp"]})
-        self.index.add_documents([doc])
-        self.index.save_local(str(self.index_file))
+        self._pending_documents.append(self._to_document(entry))
+        if len(self._pending_documents) >= EMBED_BATCH_SIZE:
+            self._index_pending()
+            if self._unsaved_entries >= INDEX_FLUSH_EVERY:
+                self.flush()
+
+    def _index_pending(self):
+        """Embed the buffered entries in one batch and add them to the vector index."""
+        if self._pending_documents:
+            self.index.add_documents(self._pending_documents)
+            self._unsaved_entries += len(self._pending_documents)
+            self._pending_documents = []
+
+    def flush(self):
+        """
+        Index any buffered entries and save the vector index to disk if it has entries that haven't been saved yet.
+
+        Entries are indexed automatically in batches of EMBED_BATCH_SIZE and before each search, and the
+        index is saved automatically every INDEX_FLUSH_EVERY entries and, if it was loaded, when the
+        process exits. Entries that were logged but never indexed are indexed the next time the index is loaded.
+        """
+        self._index_pending()
+        if self._unsaved_entries:
+            self.index.save_local(str(self.index_file))
+            self._unsaved_entries = 0
 
     def get_recent_context(self, n: int = 5) -> List[Dict]:
         """
@@ -92,31 +175,43 @@ class History:
         """
         return self.history[-n:]
 
-    def search_history(self, query: str, k: int = 5) -> List[Dict]:
+    def search_history(self, query: str, k: int = 5, sort: Literal["relevance", "time"] = "relevance") -> List[Dict]:
         """
         Search the history for entries similar to the given query using vector search.
 
         Args:
         query (str): The search term to look for in the history.
         k (int): The number of results to return.
+        sort (str): "relevance" to return the most similar entries first, or "time" to sort them by timestamp.
 
         Returns:
-        List[Dict]: A list of history entries that are most similar to the query, sorted by timestamp.
+        List[Dict]: A list of history entries that are most similar to the query, in the requested order.
 
         Example:
         >>> history = History()
-        >>> results = history.search_history("dragon attack", k=3)
+        >>> results = history.search_history("dragon attack", k=3, sort="time")
         >>> for entry in results:
         ...     print(f"{entry['timestamp']} - {entry['role']}: {entry['content']}")
         """
+        self._index_pending()
         results = self.index.similarity_search(query, k=k)
         entries = [
-            {
-                "role": doc.page_content.split(":")[0],
-                "content": ":".join(doc.page_content.split(":")[1:]).strip(),
-                "timestamp": doc.metadata["timestamp"]
-            }
+            dict(doc.metadata) if "role" in doc.metadata else self._parse_legacy_document(doc)
             for doc in results
         ]
-        # Sort the entries by timestamp
-        return sorted(entries, key=itemgetter('timestamp'))
\ No newline at end of file
+        if sort == "time":
+            # ISO timestamps sort chronologically as strings
+            entries.sort(key=itemgetter('timestamp'))
+        return entries
+
+    @staticmethod
+    def _to_document(entry: Dict) -> 'Document':
+        """The index document for a history entry, which keeps the entry itself as its metadata."""
+        from langchain.docstore.document import Document
+        return Document(page_content=f"{entry['role']}: {entry['content']}", metadata=entry)
+
+    @staticmethod
+    def _parse_legacy_document(doc: 'Document') -> Dict:
+        """Rebuild the entry for a document indexed before entries were stored in its metadata."""
+        role, _, content = doc.page_content.partition(":")
+        return {"role": role, "content": content.strip(), "timestamp": doc.metadata["timestamp"]}
\ No newline at end of file
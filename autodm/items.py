@@ -1,5 +1,8 @@
 from typing import Dict, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Item types that share another type's equipment slot
+_SLOT_REMAP = {'shield': 'armor'}
 
 class Item(BaseModel):
     """
@@ -23,6 +26,8 @@ class Item(BaseModel):
         >>> print(longsword)
         Longsword (weapon)
     """
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     item_type: str  # e.g., "weapon", "armor", "accessory"
@@ -40,14 +45,31 @@ class WeaponAttack(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-class EquipmentItem(BaseModel):
-    name: str
+class EquipmentItem(Item):
+    """An Item that can be carried in quantity and equipped, with damage dice or armor class in its effects."""
     quantity: int
     weight: float
-    item_type: str
     description: Optional[str] = None
-    equippable: bool = False
     effects: Dict[str, Union[int, str]] = {}  # Allow both int and str values
 
+    @field_validator('item_type')
+    @classmethod
+    def normalize_item_type(cls, item_type: str) -> str:
+        """Store item types lowercased so equipment code can compare them directly."""
+        return item_type.lower()
+
+    @property
+    def armor_class_base(self) -> Optional[int]:
+        """The item's numeric armor class, parsed from its effects (e.g. "11 + Dex modifier" -> 11)."""
+        armor_class = self.effects.get('armor_class')
+        if armor_class is None or isinstance(armor_class, int):
+            return armor_class
+        return int(armor_class.split()[0])
+
+    @property
+    def slot(self) -> str:
+        """The equipment slot this item occupies (shields share the armor slot)."""
+        return _SLOT_REMAP.get(self.item_type, self.item_type)
+
     def __str__(self):
         return f"{self.name} (x{self.quantity})"
\ No newline at end of file
@@ -1,10 +1,38 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import Literal, Optional
+
 from llama_index.llms.ollama import Ollama
 from llama_index.llms.gemini import Gemini
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
+# Completions of cached prompts, one JSON file per prompt, kept across runs
+LLM_CACHE_DIR = Path.home() / ".autodm" / "llm_cache"
+# Most completions kept in LLM_CACHE_DIR; the least recently used are deleted beyond this
+LLM_CACHE_MAX_ENTRIES = 1024
+# Set AUTODM_CACHE_LLM=1 to answer every repeated prompt from the cache, e.g. for repeatable test and seed runs
+CACHE_ALL_COMPLETIONS = os.getenv("AUTODM_CACHE_LLM") == "1"
+
+# "smart" serves narration and open-ended reasoning; "fast" serves simple, templated requests
+LLMTier = Literal["fast", "smart"]
+
+# All Gemini safety settings set to BLOCK_NONE
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+}
+
 class LLMManager:
     _instance = None
 
@@ -16,30 +44,102 @@ class LLMManager:
             # cls._instance.llm = Ollama(model="llama3.1")
             # cls._instance.llm = Ollama(model='hermes3')
             
-            # Gemini model with all safety settings set to BLOCK_NONE
-            cls._instance.llm = Gemini(
-                model='models/gemini-1.5-flash',
-                safety_settings={
-                    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                }
-            )
+            # Gemini models with all safety settings set to BLOCK_NONE
+            cls._instance.llm = Gemini(model='models/gemini-1.5-flash', safety_settings=SAFETY_SETTINGS)
+            cls._instance.fast_llm = Gemini(model='models/gemini-1.5-flash-8b', safety_settings=SAFETY_SETTINGS)
         return cls._instance
 
     @classmethod
-    def get_llm(cls):
-        return cls().llm
+    def get_llm(cls, tier: LLMTier = "smart"):
+        return cls().fast_llm if tier == "fast" else cls().llm
 
     @classmethod
     def complete(cls, prompt: str) -> str:
         return cls().llm.complete(prompt).text
 
+    @classmethod
+    async def acomplete(cls, prompt: str) -> str:
+        return (await cls().llm.acomplete(prompt)).text
+
 llm_manager = LLMManager()
 
-def get_llm():
-    return llm_manager.get_llm()
+def get_llm(tier: LLMTier = "smart"):
+    return llm_manager.get_llm(tier)
 
 def complete(prompt: str) -> str:
-    return llm_manager.complete(prompt)
\ No newline at end of file
+    if CACHE_ALL_COMPLETIONS:
+        return cached_complete(prompt)
+    return llm_manager.complete(prompt)
+
+async def acomplete(prompt: str) -> str:
+    if CACHE_ALL_COMPLETIONS:
+        # A cache miss blocks on the synchronous client, so keep it off the event loop
+        return await asyncio.to_thread(cached_complete, prompt)
+    return await llm_manager.acomplete(prompt)
+
+@lru_cache(maxsize=1024)
+def cached_complete(prompt: str) -> str:
+    """
+    Complete a prompt, answering repeats of an identical prompt from a cache.
+
+    Repeats within a run are answered from memory. Completions are also saved under
+    LLM_CACHE_DIR, keyed by the model and prompt, so later runs reuse them too.
+    """
+    model = llm_manager.llm.model
+    key = hashlib.blake2b(f"{model}\0{prompt}".encode(), digest_size=16).hexdigest()
+    cache_file = LLM_CACHE_DIR / f"{key}.json"
+    response = _read_cache_entry(cache_file)
+    if response is not None:
+        return response
+
+    response = llm_manager.complete(prompt)
+    _write_cache_entry(cache_file, {"model": model, "prompt": prompt, "response": response})
+    _evict_llm_cache()
+    return response
+
+def _read_cache_entry(cache_file: Path) -> Optional[str]:
+    """Read a cached completion, or return None if it is missing or unreadable (which then counts as a miss)."""
+    try:
+        os.utime(cache_file)  # The modification time records when an entry was last used
+        with open(cache_file, 'r') as f:
+            return json.load(f)["response"]
+    except FileNotFoundError:
+        # Never cached, or evicted or cleared by another thread in the meantime
+        return None
+    except (json.JSONDecodeError, KeyError):
+        cache_file.unlink(missing_ok=True)
+        return None
+
+def _write_cache_entry(cache_file: Path, entry: dict):
+    """Write a cache entry atomically, so an interrupted write never leaves a truncated file behind."""
+    LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=LLM_CACHE_DIR, suffix=".tmp", delete=False) as f:
+        try:
+            json.dump(entry, f)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, cache_file)
+
+def _last_used(path: Path) -> Optional[float]:
+    """When a cache entry was last used, or None if another thread has already deleted it."""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+def _evict_llm_cache():
+    """Delete the least recently used entries in LLM_CACHE_DIR beyond LLM_CACHE_MAX_ENTRIES."""
+    entries = list(LLM_CACHE_DIR.glob("*.json"))
+    if len(entries) <= LLM_CACHE_MAX_ENTRIES:
+        return
+    last_used = [(mtime, path) for path in entries if (mtime := _last_used(path)) is not None]
+    last_used.sort(key=itemgetter(0))
+    for _, path in last_used[:-LLM_CACHE_MAX_ENTRIES]:
+        path.unlink(missing_ok=True)
+
+def clear_llm_cache():
+    """Forget every cached completion, both in memory and in LLM_CACHE_DIR."""
+    cached_complete.cache_clear()
+    for path in LLM_CACHE_DIR.glob("*.json"):
+        path.unlink(missing_ok=True)
\ No newline at end of file
@@ -1,3 +1,5 @@
+import asyncio
+
 from .player_agent import PlayerAgent
 from .character import Character
 from .npc import NPC
@@ -19,17 +21,18 @@ def equip_character(character):
             character.add_spell(fireball)  # 3rd level spell
         
         # Set spell slots
-        character.spell_slots = {
-             1: 4 if character.level >= 1 else 0,
-             2: 2 if character.level >= 3 else 0,
-             3: 2 if character.level >= 5 else 0,
-             4: 1 if character.level >= 7 else 0,
-             5: 0, 6: 0, 7: 0, 8: 0, 9: 0
-        }
+        character.spell_slots = [
+            0,
+            4 if character.level >= 1 else 0,
+            2 if character.level >= 3 else 0,
+            2 if character.level >= 5 else 0,
+            1 if character.level >= 7 else 0,
+            0, 0, 0, 0, 0
+        ]
     
     elif character.chr_class.lower() == "fighter":
         longsword = EquipmentItem(name="Longsword", item_type="weapon", effects={"damage": "1d8"}, quantity=1, weight=3.0)
-        shield_item = EquipmentItem(name="Shield", item_type="armor", effects={"armor_class": 2}, quantity=1, weight=6.0)
+        shield_item = EquipmentItem(name="Shield", item_type="shield", effects={"armor_class": 2}, quantity=1, weight=6.0)
         character.equip_item(longsword)
         character.equip_item(shield_item)
     elif character.chr_class.lower() == "barbarian":
@@ -51,12 +54,14 @@ def main():
     equip_character(thorne)
     player2 = PlayerAgent(thorne)
 
-    # Create NPCs
-    groknak = NPC.generate("Groknak", "Barbarian", "Half-Orc", level=3)
+    # Create NPCs, generating their backstories concurrently
+    groknak, zira = asyncio.run(NPC.agenerate_many([
+        {"name": "Groknak", "chr_class": "Barbarian", "chr_race": "Half-Orc", "level": 3},
+        {"name": "Zira", "chr_class": "Rogue", "chr_race": "Elf", "level": 3},
+    ]))
     equip_character(groknak)
     npc1 = groknak
 
-    zira = NPC.generate("Zira", "Rogue", "Elf", level=3)
     equip_character(zira)
     npc2 = zira
 
@@ -64,13 +69,13 @@ def main():
     for player in [player1, player2]:
         print(f"- {player.character.name}, a level {player.character.level} {player.character.chr_race} {player.character.chr_class}")
         print(f"  Known spells: {', '.join([spell.name for spell in player.character.spells])}")
-        print(f"  Spell slots: {player.character.spell_slots}")
-        print(f"  Equipped items: {', '.join([item.name for slot in player.character.equipped_items.values() for item in slot if item])}")
+        print(f"  Spell slots: {', '.join(f'L{level}: {slots}' for level, slots in enumerate(player.character.spell_slots) if slots)}")
+        print(f"  Equipped items: {', '.join([item.name for item in player.character.equipped])}")
 
     print("\nEnemies:")
     for npc in [npc1, npc2]:
         print(f"- {npc.name}, a level {npc.level} {npc.chr_race} {npc.chr_class}")
-        print(f"  Equipped items: {', '.join([item.name for slot in npc.equipped_items.values() for item in slot if item])}")
+        print(f"  Equipped items: {', '.join([item.name for item in npc.equipped])}")
     
     # Start the battle
     battle = Battle([player1, player2], [npc1, npc2])
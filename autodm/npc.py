@@ -1,8 +1,13 @@
-from typing import Optional, Dict, TYPE_CHECKING, Any
+from typing import Optional, Dict, List, TYPE_CHECKING, Any
+import asyncio
 from .character import Character, Attributes
-from .llm import get_llm, complete
+from .llm import get_llm, complete, acomplete
 import random
 from pydantic import Field
+from .types import COMBATANT_SUMMARY
+
+# Most backstory requests NPC.agenerate_many keeps in flight at once, to stay under the LLM's rate limit
+MAX_CONCURRENT_GENERATIONS = 8
 
 if TYPE_CHECKING:
     from .battle import Battle
@@ -20,8 +25,8 @@ class NPC(Character):
 
         battle_state = self.battle.get_battle_state()
         
-        allies_info = "\n".join([f"- {ally['name']} (Level {ally['level']} {ally['class']}): {ally['hp']}/{ally['max_hp']} HP" for ally in battle_state['enemies']])  # NPCs are enemies of players
-        enemies_info = "\n".join([f"- {enemy['name']} (Level {enemy['level']} {enemy['class']}): {enemy['hp']}/{enemy['max_hp']} HP" for enemy in battle_state['allies']])  # Players are enemies of NPCs
+        allies_info = "\n".join(["- " + COMBATANT_SUMMARY % ally for ally in battle_state['enemies']])  # NPCs are enemies of players
+        enemies_info = "\n".join(["- " + COMBATANT_SUMMARY % enemy for enemy in battle_state['allies']])  # Players are enemies of NPCs
         
         return f"""
 You are currently in a battle.
@@ -61,9 +66,9 @@ Consider the battle situation when making decisions.
         )
         self.backstory = backstory
 
-    @classmethod
-    def generate(cls, name: str, chr_class: str, chr_race: str, level: int = 1):
-        attributes = Attributes(
+    @staticmethod
+    def _roll_attributes() -> Attributes:
+        return Attributes(
             strength=random.randint(8, 18),
             dexterity=random.randint(8, 18),
             constitution=random.randint(8, 18),
@@ -71,12 +76,60 @@ Consider the battle situation when making decisions.
             wisdom=random.randint(8, 18),
             charisma=random.randint(8, 18)
         )
-        
-        backstory_prompt = f"Generate a brief backstory for {name}, a level {level} {chr_race} {chr_class}."
-        backstory = complete(backstory_prompt)
-        
+
+    @staticmethod
+    def _backstory_prompt(name: str, chr_class: str, chr_race: str, level: int) -> str:
+        return f"Generate a brief backstory for {name}, a level {level} {chr_race} {chr_class}."
+
+    @classmethod
+    def generate(cls, name: str, chr_class: str, chr_race: str, level: int = 1):
+        attributes = cls._roll_attributes()
+        backstory = complete(cls._backstory_prompt(name, chr_class, chr_race, level))
         return cls(name, chr_class, level, chr_race, attributes, backstory)
 
+    @classmethod
+    async def agenerate(cls, name: str, chr_class: str, chr_race: str, level: int = 1):
+        """
+        Generate an NPC like `generate`, awaiting the backstory instead of blocking on it.
+
+        The backstory is the only LLM call, so several NPCs can be generated concurrently
+        with asyncio.gather and take about as long as generating one.
+
+        Example:
+        >>> groknak, zira = await asyncio.gather(
+        ...     NPC.agenerate("Groknak", "Barbarian", "Half-Orc", level=3),
+        ...     NPC.agenerate("Zira", "Rogue", "Elf", level=3),
+        ... )
+        """
+        attributes = cls._roll_attributes()
+        backstory = await acomplete(cls._backstory_prompt(name, chr_class, chr_race, level))
+        return cls(name, chr_class, level, chr_race, attributes, backstory)
+
+    @classmethod
+    async def agenerate_many(cls, specs: List[Dict[str, Any]]) -> List['NPC']:
+        """
+        Generate several NPCs at once, requesting their backstories concurrently.
+
+        Args:
+        specs (List[Dict[str, Any]]): Keyword arguments for `generate`, one dict per NPC.
+
+        Returns:
+        List[NPC]: The generated NPCs, in the same order as `specs`.
+
+        Example:
+        >>> groknak, zira = await NPC.agenerate_many([
+        ...     {"name": "Groknak", "chr_class": "Barbarian", "chr_race": "Half-Orc", "level": 3},
+        ...     {"name": "Zira", "chr_class": "Rogue", "chr_race": "Elf", "level": 3},
+        ... ])
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+        async def generate_one(spec: Dict[str, Any]) -> 'NPC':
+            async with semaphore:
+                return await cls.agenerate(**spec)
+
+        return list(await asyncio.gather(*(generate_one(spec) for spec in specs)))
+
     def converse(self, message: str) -> str:
         context = (
             f"You are narrating the actions and speech of {self.name}, a {self.chr_race} {self.chr_class}. "
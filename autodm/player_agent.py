@@ -1,53 +1,209 @@
-from typing import List, Optional, Dict, Union, TYPE_CHECKING
-from llama_index.core.tools import BaseTool, FunctionTool
+from functools import cached_property, lru_cache
+import re
+import numpy as np
+from typing import List, Optional, Dict, Set, Tuple, Union, TYPE_CHECKING
+from llama_index.core.tools import BaseTool, FunctionTool, ToolMetadata
 from llama_index.core.agent import ReActAgent
+from llama_index.core.chat_engine.types import AgentChatResponse
 from .character import Character, Attributes
 from .spells import Spell
-from pydantic import Field
+from pydantic import Field, create_model
 from .llm import get_llm, complete
+from .cache import semantic_cache
 
 if TYPE_CHECKING:
     from .battle import Battle
 else:
     from .types import Battle
+from .types import COMBATANT_SUMMARY
+
+# Canonical commands that map straight onto one tool call, answered without the LLM.
+# Each pattern must match the whole input; named groups become the tool's arguments.
+DIRECT_COMMANDS = tuple((re.compile(pattern, re.IGNORECASE), tool_name) for pattern, tool_name in (
+    (r"attack (?:the )?(?P<target>\w+)", "attack"),
+    (r"cast (?P<spell_name>.+?) (?:on|at) (?:the )?(?P<target>\w+)", "cast_spell"),
+    (r"cast (?P<spell_name>.+)", "cast_spell"),
+    (r"use (?:my |the |a )?(?P<item_name>.+)", "use_item"),
+    (r"move (?P<direction>\w+)", "move"),
+    (r"say (?P<message>.+)", "say"),
+    (r"(?:check )?(?:my )?(?:hp|health)", "check_hp"),
+    (r"(?:check )?(?:my )?status", "check_status"),
+    (r"(?:check )?(?:my )?inventory", "check_inventory"),
+    (r"(?:check )?(?:my )?spells", "check_spells"),
+    (r"(?:check )?(?:my )?attributes", "check_attributes"),
+    (r"(?:check )?(?:my )?equipment", "check_equipment"),
+    (r"(?:check )?(?:my )?skills", "check_skills"),
+    (r"(?:check|observe) (?:the )?battle", "observe_battle"),
+))
+
+# Words that mark input as open-ended enough to need the smart model; anything else goes to the fast one
+SMART_KEYWORDS = frozenset({
+    "describe", "narrate", "plan", "strategy", "why", "how", "explain",
+    "persuade", "deceive", "intimidate", "convince", "negotiate",
+})
+
+def _tool_metadata(name: str, signature: str, description: str, **args) -> ToolMetadata:
+    """Declare a tool's metadata, with an argument schema built from (type, default) pairs."""
+    return ToolMetadata(
+        name=name,
+        description=f"{name}{signature}\n{description}",
+        fn_schema=create_model(name, **args),
+    )
+
+# Metadata for every PlayerAgent method exposed as a tool, in the order the agent sees them.
+# Declared once at import so agents bind their methods without introspecting signatures or docstrings.
+TOOL_METADATA: Dict[str, ToolMetadata] = {metadata.name: metadata for metadata in (
+    _tool_metadata("move", "(direction: str) -> str", "Move in a direction.", direction=(str, ...)),
+    _tool_metadata("attack", "(target: str) -> str", "Attack a target with the equipped weapon.", target=(str, ...)),
+    _tool_metadata("cast_spell", "(spell_name: str, target: str = '') -> str", "Cast a known spell, optionally at a target.",
+                   spell_name=(str, ...), target=(str, "")),
+    _tool_metadata("use_item", "(item_name: str) -> str", "Use an item from the inventory.", item_name=(str, ...)),
+    _tool_metadata("check_inventory", "() -> str", "List the items in the inventory."),
+    _tool_metadata("check_status", "() -> str", "Show HP, level, class, race, armor class and other stats."),
+    _tool_metadata("intimidate", "(target: str) -> str", "Attempt to intimidate a target.", target=(str, ...)),
+    _tool_metadata("persuade", "(target: str) -> str", "Attempt to persuade a target.", target=(str, ...)),
+    _tool_metadata("deceive", "(target: str) -> str", "Attempt to deceive a target.", target=(str, ...)),
+    _tool_metadata("say", "(message: str) -> str", "Say something out loud.", message=(str, ...)),
+    _tool_metadata("check_spells", "() -> str", "List known spells and available spell slots."),
+    _tool_metadata("check_attributes", "() -> str", "Show attribute scores and modifiers."),
+    _tool_metadata("check_equipment", "() -> str", "List equipped items by slot."),
+    _tool_metadata("check_hp", "() -> str", "Show current and maximum HP."),
+    _tool_metadata("check_skills", "() -> str", "List skills and their modifiers."),
+    _tool_metadata("observe_battle", "() -> str", "Observe the current state of the battle."),
+)}
+
+# Tools that only report on the character or battle; a turn that calls anything else may end the
+# turn or change state (its result is fed to Battle.apply_action_effects), so it is never cached
+READ_ONLY_TOOLS = frozenset({
+    "check_inventory", "check_status", "check_spells", "check_attributes",
+    "check_equipment", "check_hp", "check_skills", "observe_battle",
+})
+
+# Tools the agent's standing instructions tell it to use, so they are offered on every turn
+PINNED_TOOLS = frozenset({"check_spells", "cast_spell"})
+
+# How many more tools, chosen by relevance to the user input, the agent sees on each turn
+TOOL_TOP_K = 6
+
+# Positions in TOOL_METADATA of the pinned tools and of the tools that are ranked
+_PINNED_INDICES = [i for i, name in enumerate(TOOL_METADATA) if name in PINNED_TOOLS]
+_RANKED_INDICES = [i for i, name in enumerate(TOOL_METADATA) if name not in PINNED_TOOLS]
+
+@lru_cache(maxsize=1)
+def _tool_vectors() -> np.ndarray:
+    """Embeddings of every tool description, in TOOL_METADATA order, computed in one batch per process."""
+    descriptions = [metadata.description for metadata in TOOL_METADATA.values()]
+    return np.asarray(semantic_cache.embeddings.embed_documents(descriptions), dtype=np.float32)
+
+class _ToolRetriever:
+    """Adapts PlayerAgent.retrieve_tools to the retriever interface ReActAgent's tool_retriever expects."""
+    def __init__(self, player_agent: 'PlayerAgent'):
+        self.player_agent = player_agent
+
+    def retrieve(self, message: str) -> List[BaseTool]:
+        return self.player_agent.retrieve_tools(message)
 
 class PlayerAgent:
     character: Character
-    tools: List[BaseTool]
-    agent: ReActAgent
     allies: Dict[str, Character] = Field(default_factory=dict)
     enemies: Dict[str, Character] = Field(default_factory=dict)
     battle: Optional['Battle'] = None
 
     def __init__(self, character: Character):
         self.character = character
-        self.tools = [
-            FunctionTool.from_defaults(fn=self.move, name="move"),
-            FunctionTool.from_defaults(fn=self.attack, name="attack"),
-            FunctionTool.from_defaults(fn=self.cast_spell, name="cast_spell"),
-            FunctionTool.from_defaults(fn=self.use_item, name="use_item"),
-            FunctionTool.from_defaults(fn=self.check_inventory, name="check_inventory"),
-            FunctionTool.from_defaults(fn=self.check_status, name="check_status"),
-            FunctionTool.from_defaults(fn=self.intimidate, name="intimidate"),
-            FunctionTool.from_defaults(fn=self.persuade, name="persuade"),
-            FunctionTool.from_defaults(fn=self.deceive, name="deceive"),
-            FunctionTool.from_defaults(fn=self.say, name="say"),
-            FunctionTool.from_defaults(fn=self.check_spells, name="check_spells"),
-            FunctionTool.from_defaults(fn=self.check_attributes, name="check_attributes"),
-            FunctionTool.from_defaults(fn=self.check_equipment, name="check_equipment"),
-            FunctionTool.from_defaults(fn=self.check_hp, name="check_hp"),
-            FunctionTool.from_defaults(fn=self.check_skills, name="check_skills"),
-            FunctionTool.from_defaults(fn=self.observe_battle, name="observe_battle"),
-        ]
-        self.agent = ReActAgent.from_tools(self.tools, llm=get_llm(), verbose=True)
+        # (battle.state_version, text) memos for the battle descriptions
+        self._battle_context: Optional[Tuple[int, str]] = None
+        self._battle_observation: Optional[Tuple[int, str]] = None
+        # Embedding of the user input being interpreted, reused for tool retrieval
+        self._input_vector: Optional[np.ndarray] = None
+        # id(agent) -> battle context lines that agent has already been sent
+        self._battle_lines_seen: Dict[int, Set[str]] = {}
+
+    @cached_property
+    def tools(self) -> List[BaseTool]:
+        """This agent's methods bound as tools, built on first use."""
+        return [FunctionTool(fn=getattr(self, name), metadata=metadata) for name, metadata in TOOL_METADATA.items()]
+
+    @cached_property
+    def agent(self) -> ReActAgent:
+        """The ReAct agent for open-ended input, on the smart model, built on first use."""
+        return ReActAgent.from_tools(tool_retriever=_ToolRetriever(self), llm=get_llm("smart"), context=self._preamble(), verbose=True)
+
+    @cached_property
+    def fast_agent(self) -> ReActAgent:
+        """The ReAct agent for simple input, on the fast model, built on first use."""
+        return ReActAgent.from_tools(tool_retriever=_ToolRetriever(self), llm=get_llm("fast"), context=self._preamble(), verbose=True)
+
+    def retrieve_tools(self, message: str) -> List[BaseTool]:
+        """
+        Select the PINNED_TOOLS plus the TOOL_TOP_K other tools whose descriptions best match the user input being interpreted.
+
+        Args:
+        message (str): The agent's message, embedded only if no user input embedding is available.
+
+        Returns:
+        List[BaseTool]: The selected tools, in TOOL_METADATA order.
+        """
+        query = self._input_vector if self._input_vector is not None else semantic_cache.embed(message)
+        scores = _tool_vectors()[_RANKED_INDICES] @ query
+        best = [_RANKED_INDICES[j] for j in np.argsort(scores)[-TOOL_TOP_K:]]
+        return [self.tools[i] for i in sorted(_PINNED_INDICES + best)]
+
+    def _agent_for(self, user_input: str) -> ReActAgent:
+        """Pick the agent for the input: the smart one if it contains any SMART_KEYWORDS, else the fast one."""
+        words = re.findall(r"[a-z]+", user_input.lower())
+        return self.agent if SMART_KEYWORDS.intersection(words) else self.fast_agent
 
     def interpret_action(self, user_input: str) -> str:
+        response, agent, context, partition, prompt_vector = self._start_interpretation(user_input)
+        if response is not None:
+            return response
+        return self._finish_interpretation(agent.chat(context), partition, prompt_vector)
+
+    async def ainterpret_action(self, user_input: str) -> str:
+        """
+        Interpret user input like interpret_action, but await the LLM so several agents can think concurrently.
+
+        Example:
+        >>> responses = await asyncio.gather(*[player.ainterpret_action(text) for player, text in turns])
+        """
+        response, agent, context, partition, prompt_vector = self._start_interpretation(user_input)
+        if response is not None:
+            return response
+        return self._finish_interpretation(await agent.achat(context), partition, prompt_vector)
+
+    def _start_interpretation(self, user_input: str) -> Tuple[Optional[str], Optional[ReActAgent], str, str, Optional[np.ndarray]]:
+        """
+        Do everything in interpreting user input that comes before the LLM call.
+
+        Returns:
+        Tuple: (response, agent, context, partition, prompt_vector). response is set when the input was
+        answered without the LLM; otherwise agent should be sent context and the result passed to
+        _finish_interpretation with partition and prompt_vector.
+        """
+        response = self._direct_command(user_input)
+        if response is not None:
+            return response, None, "", "", None
+
         battle_context = self.get_battle_context() if self.battle else ""
         
-        context = f"""
+        # Only reuse a response for the same character in the same state and battle situation
+        partition = self._cache_partition(battle_context)
+        cached, prompt_vector = semantic_cache.lookup(partition, user_input)
+        if cached is not None:
+            return cached, None, "", "", None
+        self._input_vector = prompt_vector
+
+        agent = self._agent_for(user_input)
+        battle_update = self._battle_update(agent, battle_context) if battle_context else ""
+        context = f"{battle_update}\nUser input: {user_input}"
+        return None, agent, context, partition, prompt_vector
+
+    def _preamble(self) -> str:
+        """The agent's standing instructions; they don't change between turns, so they go in the system prompt once."""
+        return f"""
 You are an interpreter for {self.character.name}, a level {self.character.level} \
 {self.character.chr_race} {self.character.chr_class}. 
-{battle_context}
 Based on the user's input, determine the most appropriate action to take then take that action. \
 For example, if the user wants to cast a spell, first check if the character knows the spell using the check_spells function. \
 Then, if the spell is known, use the cast_spell function with the appropriate parameters. \
@@ -56,19 +212,77 @@ Respond with the result of the action taken. \
 If you cannot determine the action to take, respond with "The narrator is confused by these strange words, can you try again?" \
 If you do not call a function, the action will not be taken. \
 During battle, once an action like casting a spell or attacking is taken, the turn should end.
-
-User input: {user_input} \
 """
-        response = self.agent.chat(context)
-        return str(response)
+
+    def _battle_update(self, agent: ReActAgent, battle_context: str) -> str:
+        """
+        The battle context to send an agent: in full the first time, then only the combatant lines that changed.
+
+        Each agent keeps its own chat memory, so what it has already seen is tracked per agent.
+        """
+        lines = battle_context.splitlines()
+        seen = self._battle_lines_seen.get(id(agent))
+        self._battle_lines_seen[id(agent)] = set(lines)
+        if seen is None:
+            return battle_context
+        changed = [line for line in lines if line.startswith("- ") and line not in seen]
+        return "Battle changes since your last message:\n" + "\n".join(changed) if changed else ""
+
+    def _finish_interpretation(self, chat_response: AgentChatResponse, partition: str, prompt_vector: np.ndarray) -> str:
+        """Cache the agent's response if the turn only called READ_ONLY_TOOLS, and return it."""
+        response = str(chat_response)
+        # Actions must run again (possibly at a different target), so only cache read-only turns
+        if all(source.tool_name in READ_ONLY_TOOLS for source in chat_response.sources):
+            semantic_cache.insert(partition, prompt_vector, response)
+        return response
+
+    def _direct_command(self, user_input: str) -> Optional[str]:
+        """Run the tool for a canonical command directly, or return None if the input isn't one."""
+        command = user_input.strip()
+        for pattern, tool_name in DIRECT_COMMANDS:
+            match = pattern.fullmatch(command)
+            if match:
+                args = match.groupdict()
+                if tool_name == "cast_spell":
+                    args = self._known_spell_args(**args)
+                    if args is None:
+                        return None
+                elif tool_name == "use_item" and not self.character.get_inventory_item(args["item_name"]):
+                    # e.g. "use my potion on Bob" names more than an item, so let the agent read it
+                    return None
+                return getattr(self, tool_name)(**args)
+        return None
+
+    def _known_spell_args(self, spell_name: str, target: str = "") -> Optional[Dict[str, str]]:
+        """
+        Split a direct cast command into a spell the character knows and an optional target.
+
+        "cast fireball goblin" names its target without "on" or "at", so when the whole text isn't a
+        known spell, its last word is tried as the target. Returns None if no known spell matches, so
+        the input goes to the agent instead.
+        """
+        if self.character.get_spell(spell_name):
+            return {"spell_name": spell_name, "target": target}
+        if not target:
+            name, _, last_word = spell_name.rpartition(" ")
+            if name and self.character.get_spell(name):
+                return {"spell_name": name, "target": last_word}
+        return None
+
+    def _cache_partition(self, battle_context: str) -> str:
+        """The semantic cache partition for the character's current state and battle context."""
+        return f"{self.character.model_dump_json()}\n{battle_context}"
 
     def get_battle_context(self) -> str:
+        if self._battle_context is not None and self._battle_context[0] == self.battle.state_version:
+            return self._battle_context[1]
+
         battle_state = self.battle.get_battle_state()
         
-        allies_info = "\n".join([f"- {ally['name']} (Level {ally['level']} {ally['class']}): {ally['hp']}/{ally['max_hp']} HP" for ally in battle_state['allies']])
-        enemies_info = "\n".join([f"- {enemy['name']} (Level {enemy['level']} {enemy['class']}): {enemy['hp']}/{enemy['max_hp']} HP" for enemy in battle_state['enemies']])
+        allies_info = "\n".join(["- " + COMBATANT_SUMMARY % ally for ally in battle_state['allies']])
+        enemies_info = "\n".join(["- " + COMBATANT_SUMMARY % enemy for enemy in battle_state['enemies']])
         
-        return f"""
+        battle_context = f"""
 You are currently in a battle.
 Your allies:
 {allies_info}
@@ -78,17 +292,20 @@ Your enemies:
 
 Remember to consider the battle situation when interpreting actions.
 """
+        self._battle_context = (self.battle.state_version, battle_context)
+        return battle_context
 
     def move(self, direction: str) -> str:
         return f"{self.character.name} moves {direction}."
 
     def attack(self, target: str) -> str:
-        weapon = self.character.get_equipped_weapons()[0] if self.character.get_equipped_weapons() else None
+        weapons = self.character.get_equipped_weapons()
+        weapon = weapons[0] if weapons else None
         weapon_name = weapon.name if weapon else "an unarmed strike"
         return f"{self.character.name} attacks {target} with {weapon_name}."
 
     def cast_spell(self, spell_name: str, target: str = "") -> str:
-        spell = next((s for s in self.character.spells if s.name.lower() == spell_name.lower()), None)
+        spell = self.character.get_spell(spell_name)
         if not spell:
             return f"{self.character.name} doesn't know the spell {spell_name}."
         if not self.character.can_cast_spell(spell):
@@ -105,7 +322,7 @@ Remember to consider the battle situation when interpreting actions.
             return str(e)
 
     def use_item(self, item_name: str) -> str:
-        item = next((i for i in self.character.inventory if i.name.lower() == item_name.lower()), None)
+        item = self.character.get_inventory_item(item_name)
         if not item:
             return f"{self.character.name} doesn't have {item_name} in their inventory."
         return f"{self.character.name} uses {item_name}."
@@ -143,18 +360,14 @@ Remember to consider the battle situation when interpreting actions.
 
     def check_spells(self) -> str:
         spells = ", ".join([spell.name for spell in self.character.spells]) if self.character.spells else "No spells known"
-        spell_slots = ", ".join([f"Level {level}: {slots}" for level, slots in self.character.spell_slots.items() if slots > 0])
+        spell_slots = ", ".join([f"Level {level}: {slots}" for level, slots in enumerate(self.character.spell_slots) if slots > 0])
         return f"{self.character.name}'s known spells: {spells}\nAvailable spell slots: {spell_slots}"
 
     def check_attributes(self) -> str:
         return str(self.character.attributes)
 
     def check_equipment(self) -> str:
-        equipped_items = []
-        for slot, items in self.character.equipped_items.items():
-            for item in items:
-                if item:
-                    equipped_items.append(f"{slot.capitalize()}: {item.name}")
+        equipped_items = [f"{item.slot.capitalize()}: {item.name}" for item in self.character.equipped]
         equipped_str = "\n".join(equipped_items) if equipped_items else "No items equipped"
         return f"{self.character.name}'s equipped items:\n{equipped_str}"
 
@@ -235,22 +448,28 @@ Remember to consider the battle situation when interpreting actions.
         """
         if not self.battle:
             return "You are not currently in a battle."
+        if self._battle_observation is not None and self._battle_observation[0] == self.battle.state_version:
+            return self._battle_observation[1]
 
         battle_state = self.battle.get_battle_state()
         
         allies_info = []
         for ally in battle_state['allies']:
             status = "alive" if ally['is_alive'] else "dead"
-            allies_info.append(f"{ally['name']} (Level {ally['level']} {ally['class']}): {ally['hp']}/{ally['max_hp']} HP, {status}")
+            allies_info.append(f"{COMBATANT_SUMMARY % ally}, {status}")
 
         enemies_info = []
         for enemy in battle_state['enemies']:
             status = "alive" if enemy['is_alive'] else "dead"
-            enemies_info.append(f"{enemy['name']} (Level {enemy['level']} {enemy['class']}): {enemy['hp']}/{enemy['max_hp']} HP, {status}")
+            enemies_info.append(f"{COMBATANT_SUMMARY % enemy}, {status}")
 
         battle_description = f"Battle State:\n\nAllies:\n" + "\n".join(allies_info) + "\n\nEnemies:\n" + "\n".join(enemies_info)
+        self._battle_observation = (self.battle.state_version, battle_description)
         return battle_description
 
     def set_battle(self, battle: 'Battle'):
         """Set the current battle for the player agent."""
-        self.battle = battle
\ No newline at end of file
+        self.battle = battle
+        self._battle_context = None
+        self._battle_observation = None
+        self._battle_lines_seen = {}
\ No newline at end of file
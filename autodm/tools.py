@@ -1,22 +1,28 @@
 import random
 import re
+from functools import lru_cache
 from typing import Union, Tuple, List
 
+# Dice notation such as "3d6+2": number of dice, die size and an optional flat modifier
+DICE_PATTERN = re.compile(r'(\d+)d(\d+)([+-]\d+)?')
+
+@lru_cache(maxsize=256)
+def _parse_dice(dice_string: str) -> Tuple[int, int, int]:
+    """Split a dice string into its number of dice, die size and modifier, parsing each distinct string once."""
+    match = DICE_PATTERN.match(dice_string)
+    
+    if not match:
+        raise ValueError(f"Invalid dice string format: {dice_string}")
+    
+    return int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+
 def roll_dice(dice_string: str) -> List[int]:
     """
     Roll dice based on the input string (e.g., "3d6+2").
     
     Returns a list of individual rolls.
     """
-    dice_pattern = re.compile(r'(\d+)d(\d+)([+-]\d+)?')
-    match = dice_pattern.match(dice_string)
-    
-    if not match:
-        raise ValueError(f"Invalid dice string format: {dice_string}")
-    
-    num_dice = int(match.group(1))
-    dice_type = int(match.group(2))
-    modifier = int(match.group(3) or 0)
+    num_dice, dice_type, modifier = _parse_dice(dice_string)
     
     rolls = [random.randint(1, dice_type) for _ in range(num_dice)]
     
@@ -25,6 +31,25 @@ def roll_dice(dice_string: str) -> List[int]:
     
     return rolls
 
+def roll_dice_batch(dice_string: str, n: int) -> List[List[int]]:
+    """
+    Roll the same dice n times (e.g., one "1d20" initiative roll per combatant).
+    
+    The dice string is parsed once and all dice are drawn in a single call.
+    Returns one list of individual rolls per repetition, as `roll_dice` would.
+    """
+    num_dice, dice_type, modifier = _parse_dice(dice_string)
+    
+    faces = range(1, dice_type + 1)
+    draws = random.choices(faces, k=num_dice * n)
+    batches = [draws[i * num_dice:(i + 1) * num_dice] for i in range(n)]
+    
+    if modifier != 0:
+        for rolls in batches:
+            rolls.append(modifier)
+    
+    return batches
+
 def apply_modifier(roll: int, modifier: int) -> int:
     """Apply a modifier to a roll."""
     return roll + modifier
@@ -11,4 +11,7 @@ else:
     PlayerAgent = 'PlayerAgent'  # Add this line
 
 # Add this line at the end of the file
-Battle = 'Battle'  # This is a string to avoid circular imports
\ No newline at end of file
+Battle = 'Battle'  # This is a string to avoid circular imports
+
+# One combatant from Battle.get_battle_state(), formatted with %, e.g. COMBATANT_SUMMARY % state
+COMBATANT_SUMMARY = "%(name)s (Level %(level)d %(class)s): %(hp)d/%(max_hp)d HP"
\ No newline at end of file
@@ -6,6 +6,7 @@ from setuptools import setup, find_packages
 setup(
     name='autodm',
     version='0.1',
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests"]),
     # install_requires=required,
+    install_requires=["numpy"],  # Used directly by the semantic cache and tool retrieval
 )
\ No newline at end of file
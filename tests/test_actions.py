@@ -0,0 +1,77 @@
+import pytest
+
+from autodm import actions
+from autodm.actions import AttackAction, HideAction, SkillCheckAction
+from autodm.character import Character, CharacterState
+
+
+def fixed_rolls(monkeypatch, d20, damage):
+    """Make the attack's d20 come up `d20` and its damage dice come up `damage`."""
+    monkeypatch.setattr(actions, "roll_dice", lambda dice: [d20] if dice == "1d20" else list(damage))
+
+
+@pytest.fixture
+def fighter():
+    return Character.generate("Thorne", chr_class="Fighter", chr_race="Dwarf")
+
+
+@pytest.fixture
+def goblin():
+    goblin = Character.generate("Goblin", chr_class="Rogue", chr_race="Human")
+    goblin.max_hp = goblin.current_hp = 20
+    goblin.armor_class_override = 12
+    return goblin
+
+
+def test_resolve_hit(monkeypatch, fighter, goblin):
+    fixed_rolls(monkeypatch, 20, [3, 1])
+    assert AttackAction(fighter, goblin).resolve() == (True, 4)
+    assert goblin.hp == 16
+
+
+def test_resolve_miss(monkeypatch, fighter, goblin):
+    fixed_rolls(monkeypatch, 1, [3])
+    assert AttackAction(fighter, goblin).resolve() == (False, 0)
+    assert goblin.hp == 20
+
+
+def test_resolve_with_real_dice(fighter, goblin):
+    hit, damage = AttackAction(fighter, goblin).resolve()
+    assert goblin.hp == 20 - damage
+    assert damage > 0 if hit else damage == 0
+
+
+def test_execute_describes_hit(monkeypatch, fighter, goblin):
+    fixed_rolls(monkeypatch, 20, [3])
+    assert AttackAction(fighter, goblin).execute() == (
+        "Thorne hits Goblin with Unarmed Strike for 3 damage! Goblin's HP: 17/20"
+    )
+
+
+def test_execute_describes_miss(monkeypatch, fighter, goblin):
+    fixed_rolls(monkeypatch, 1, [3])
+    assert AttackAction(fighter, goblin).execute() == (
+        "Thorne misses Goblin with Unarmed Strike. Goblin's HP: 20/20"
+    )
+
+
+def test_dead_target(fighter, goblin):
+    goblin.character_state = CharacterState.DEAD
+    action = AttackAction(fighter, goblin)
+    assert action.resolve() == (False, 0)
+    assert action.execute() == "Goblin is already dead and cannot be attacked."
+
+
+def test_skill_check(monkeypatch, fighter):
+    fighter.skills = {"athletics": 2}
+    fixed_rolls(monkeypatch, 15, [])
+    strength = fighter.attributes.get_modifier("strength")
+    assert SkillCheckAction(fighter, "Athletics").execute() == (
+        f"Thorne attempts a Athletics check: Roll: 15, Skill Modifier: 2, "
+        f"Ability Modifier: {strength}, Total: {17 + strength}"
+    )
+
+
+def test_skill_check_with_real_dice(fighter):
+    result = HideAction(fighter).execute()
+    assert result.startswith("Thorne attempts to Hide. Thorne attempts a Stealth check: Roll: ")
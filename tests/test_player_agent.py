@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("llama_index")
+
+from autodm.character import Character
+from autodm.items import EquipmentItem
+from autodm.player_agent import PlayerAgent
+
+
+@pytest.fixture
+def wizard():
+    return PlayerAgent(Character.generate("Aric", chr_class="Wizard", chr_race="Human"))
+
+
+def test_cast_spell_then_target(wizard):
+    assert wizard._direct_command("cast magic missile goblin") == "Aric casts Magic Missile at goblin."
+
+
+def test_cast_spell_on_target(wizard):
+    assert wizard._direct_command("cast magic missile at the goblin") == "Aric casts Magic Missile at goblin."
+
+
+def test_cast_spell_without_target(wizard):
+    assert wizard._direct_command("cast Magic Missile") == "Aric casts Magic Missile."
+
+
+def test_cast_unknown_spell_goes_to_agent(wizard):
+    slots = list(wizard.character.spell_slots)
+    assert wizard._direct_command("cast cure wounds goblin") is None
+    assert wizard._direct_command("cast a really big spell") is None
+    assert wizard.character.spell_slots == slots
+
+
+@pytest.fixture
+def potion():
+    return EquipmentItem(name="Healing Potion", item_type="potion", quantity=1, weight=0.5)
+
+
+def test_use_inventory_item(wizard, potion):
+    wizard.character.add_to_inventory(potion)
+    assert wizard._direct_command("use my healing potion") == "Aric uses healing potion."
+
+
+def test_use_item_on_target_goes_to_agent(wizard, potion):
+    wizard.character.add_to_inventory(potion)
+    assert wizard._direct_command("use my healing potion on Bob") is None
+    assert wizard._direct_command("use the door to escape") is None